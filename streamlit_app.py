@@ -9,43 +9,102 @@ Resume Analyzer Pro — Jobscan-style single-file Streamlit app (no DB).
 """
 
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timezone
 from io import BytesIO
 import re
 import os
-import base64
-from collections import Counter
+from collections import Counter, deque
+from functools import lru_cache
+from contextlib import contextmanager
 import math
+import itertools
+import threading
+
+# Optional libs (defensive); each is imported on first use so a cold start
+# only pays for the backends an upload actually needs.
+# PDFium (C++) bindings are preferred for PDF text, then PyMuPDF (MuPDF, C),
+# with pure-Python pypdf/PyPDF2 as the last resort
+@lru_cache(maxsize=1)
+def _get_pdfium():
+    try:
+        import pypdfium2 as pdfium
+        return pdfium
+    except Exception:
+        return None
 
-# Optional libs (defensive)
-try:
-    import PyPDF2
-except Exception:
-    PyPDF2 = None
+@lru_cache(maxsize=1)
+def _get_fitz():
+    # PyMuPDF >= 1.24 ships as "pymupdf"; older releases only expose "fitz"
+    try:
+        import pymupdf
+        return pymupdf
+    except Exception:
+        pass
+    try:
+        import fitz
+        return fitz
+    except Exception:
+        return None
 
-try:
-    import docx
-except Exception:
-    docx = None
+@lru_cache(maxsize=1)
+def _get_pypdf2():
+    # pypdf is the maintained, faster successor with the same PdfReader API
+    try:
+        import pypdf
+        return pypdf
+    except Exception:
+        pass
+    try:
+        import PyPDF2
+        return PyPDF2
+    except Exception:
+        return None
 
-# Optional sklearn for TF-IDF similarity (if available)
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except Exception:
-    SKLEARN_AVAILABLE = False
+@lru_cache(maxsize=1)
+def _get_docx():
+    try:
+        import docx
+        from docx.oxml.ns import qn
+        tags = {t: qn(f"w:{t}") for t in ("p", "r", "t", "tab", "br", "cr", "hyperlink", "tbl", "tr", "tc")}
+        return docx, tags, qn("w:type")
+    except Exception:
+        return None
+
+# Optional faster DOCX backend (reads the document XML directly)
+@lru_cache(maxsize=1)
+def _get_docx2txt():
+    try:
+        import docx2txt
+        return docx2txt
+    except Exception:
+        return None
 
-import numpy as np
+# Optional sklearn for TF-IDF similarity (if available); imported on first scan
+@lru_cache(maxsize=1)
+def _get_sklearn():
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer
+    except Exception:
+        return None
 
 # --- Page config ---
 st.set_page_config(page_title="Resume Analyzer Pro", page_icon="🚀", layout="wide")
 
+# --- Scan history bounds ---
+HISTORY_LIMIT = 50
+# history entries other than current_result keep only the fields the dashboard lists
+_HISTORY_SUMMARY_KEYS = frozenset(("timestamp", "score", "resume_name"))
+TRACKER_LIMIT = 100
+STORED_TERMS_LIMIT = 50  # JD keyword lists kept per scan (the UI shows at most a handful)
+_STATUSES = ("Applied", "Interviewing", "Offer", "Rejected")
+
 # --- Defaults for session_state ---
 DEFAULTS = {
     "page": "home",
     "user": None,
-    "scan_history": [],
+    "scan_history": deque(maxlen=HISTORY_LIMIT),
+    "tracker_history": deque(maxlen=TRACKER_LIMIT),
     "current_result": None,
     "paste_resume": "",
     "paste_jd": "",
@@ -56,166 +115,334 @@ for k, v in DEFAULTS.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+def trim_scan_history():
+    # length is capped by the deque itself; only strip heavy fields here.
+    # Full resume/JD text stays on current_result (results page), so history
+    # never needs its own copy.
+    current = st.session_state.get("current_result")
+    for e in st.session_state.scan_history:
+        if e is current or len(e) <= len(_HISTORY_SUMMARY_KEYS):
+            continue
+        for k in [k for k in e if k not in _HISTORY_SUMMARY_KEYS]:
+            del e[k]
+
 # --- Stopwords (small set) ---
-STOPWORDS = set("""
-a about above after again against all am an and any are as at be because been before being below between both but by
-could did do does doing down during each few for from further had has have having he her here hers herself him himself his
-how i if in into is it its itself me more most my no not of on once only or other our ours out over own same she should
-so some such than that the their them then there these they this those through to too under until up very was we were what
-when where which while who why with you your yours
-""".split())
+STOPWORDS = frozenset((
+    "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any", "are", "as", "at",
+    "be", "because", "been", "before", "being", "below", "between", "both", "but", "by", "could", "did",
+    "do", "does", "doing", "down", "during", "each", "few", "for", "from", "further", "had", "has", "have",
+    "having", "he", "her", "here", "hers", "herself", "him", "himself", "his", "how", "i", "if", "in",
+    "into", "is", "it", "its", "itself", "me", "more", "most", "my", "no", "not", "of", "on", "once", "only",
+    "or", "other", "our", "ours", "out", "over", "own", "same", "she", "should", "so", "some", "such",
+    "than", "that", "the", "their", "them", "then", "there", "these", "they", "this", "those", "through",
+    "to", "too", "under", "until", "up", "very", "was", "we", "were", "what", "when", "where", "which",
+    "while", "who", "why", "with", "you", "your", "yours"
+))
 
 # --- Keyword sets ---
-HARD_SKILLS = {
+HARD_SKILLS = frozenset({
     "java", "core java", "spring", "spring boot", "hibernate", "jpa", "microservices", "rest", "rest api",
     "postgresql", "mysql", "sql", "mongodb", "junit", "mockito", "maven", "gradle", "docker", "kubernetes",
     "aws", "git", "graphql", "soap", "redis", "kafka", "jenkins"
-}
-SOFT_SKILLS = {
+})
+SOFT_SKILLS = frozenset({
     "communication", "teamwork", "collaboration", "leadership", "problem solving", "adaptability",
     "time management", "mentoring", "critical thinking", "attention to detail", "constructive feedback"
-}
-ACTION_VERBS = {
+})
+ACTION_VERBS = frozenset({
     "develop", "design", "implement", "build", "maintain", "optimize", "lead", "manage", "create",
     "improve", "deploy", "test", "debug", "integrate", "automate", "document", "refactor"
-}
+})
 
 # -------------------------
 # Utilities: extract text
 # -------------------------
+# PDFium is not thread-safe, not even across documents, and Streamlit runs
+# each session's script on its own thread; serialize every pdfium call
+_PDFIUM_LOCK = threading.Lock()
+_PYMUPDF_LOCK = threading.Lock()
+
+def _extract_pdf_pdfium(pdfium, fbytes: bytes):
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(fbytes)
+        try:
+            pages = []
+            for page in pdf:
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        pages.append(textpage.get_text_range())
+                    finally:
+                        textpage.close()
+                finally:
+                    page.close()
+            return "\n".join(pages)
+        finally:
+            pdf.close()
+
+def _page_texts(pages):
+    # yield page text lazily so join() is the only buffer holding the whole document
+    for p in pages:
+        try:
+            yield p.extract_text() or ""
+        except Exception:
+            continue
+
 def safe_extract_text_from_pdf(fbytes: bytes):
+    pdfium = _get_pdfium()
+    if pdfium:
+        try:
+            text = _extract_pdf_pdfium(pdfium, fbytes)
+            if text.strip():
+                return text
+        except Exception:
+            pass
+    fitz = _get_fitz()
+    if fitz:
+        try:
+            # PyMuPDF is not thread-safe either
+            with _PYMUPDF_LOCK, fitz.open(stream=fbytes, filetype="pdf") as doc:
+                text = "\n".join(page.get_text("text") for page in doc)
+            if text.strip():
+                return text
+        except Exception:
+            pass
+    PyPDF2 = _get_pypdf2()
     if not PyPDF2:
         return ""
     try:
-        bio = BytesIO(fbytes)
-        reader = PyPDF2.PdfReader(bio)
-        pages = []
-        for p in reader.pages:
-            try:
-                pages.append(p.extract_text() or "")
-            except Exception:
-                continue
-        return "\n".join(pages)
+        reader = PyPDF2.PdfReader(BytesIO(fbytes))
+        if not reader.pages:
+            return ""
+        return "\n".join(_page_texts(reader.pages))
     except Exception:
         return ""
 
 def safe_extract_text_from_docx(fbytes: bytes):
-    if not docx:
+    docx2txt = _get_docx2txt()
+    if docx2txt:
+        try:
+            text = docx2txt.process(BytesIO(fbytes))
+            if text:
+                return text.strip()
+        except Exception:
+            pass
+    loaded = _get_docx()
+    if not loaded:
         return ""
+    docx, w, w_type = loaded
+    w_breaks = (w["br"], w["cr"])
+
+    def run_text(r):
+        # same mapping as python-docx's Run.text: tabs and line breaks survive,
+        # page/column breaks add nothing
+        for el in r:
+            if el.tag == w["t"]:
+                yield el.text or ""
+            elif el.tag == w["tab"]:
+                yield "\t"
+            elif el.tag in w_breaks and el.get(w_type) in (None, "textWrapping"):
+                yield "\n"
+
+    def para_runs(p):
+        # direct runs only (plus hyperlinked ones): a text box sits inside a run's
+        # mc:AlternateContent as a Choice and a Fallback copy, so descending would repeat it
+        for el in p:
+            if el.tag == w["r"]:
+                yield el
+            elif el.tag == w["hyperlink"]:
+                yield from el.iterchildren(w["r"])
+
+    def block_paras(parent):
+        # body-level paragraphs and table-cell paragraphs, in document order
+        for el in parent:
+            if el.tag == w["p"]:
+                yield "".join(t for r in para_runs(el) for t in run_text(r))
+            elif el.tag == w["tbl"]:
+                for tr in el.iterchildren(w["tr"]):
+                    for tc in tr.iterchildren(w["tc"]):
+                        yield from block_paras(tc)
+
     try:
-        bio = BytesIO(fbytes)
-        document = docx.Document(bio)
-        paragraphs = [p.text for p in document.paragraphs if p.text]
-        return "\n".join(paragraphs)
+        body = docx.Document(BytesIO(fbytes)).element.body
+        # walk raw runs per <w:p> instead of building Paragraph objects
+        paragraphs = block_paras(body)
+        return "\n".join(p for p in paragraphs if p)
     except Exception:
         return ""
 
-def extract_text_from_uploaded(uploaded_file):
-    if uploaded_file is None:
-        return ""
-    name = uploaded_file.name.lower()
-    raw = uploaded_file.read()
-    if name.endswith(".pdf"):
+# keyed on the upload's file_id, so Streamlit never re-hashes the file bytes
+# (the leading underscore keeps _raw out of the cache key); the spinner only
+# shows on a miss
+@st.cache_data(show_spinner="Extracting text…", max_entries=32)
+def _cached_extract(file_key, _raw: bytes) -> str:
+    raw = _raw
+    # dispatch on the file's magic bytes rather than its name, so a mislabeled
+    # upload never goes through a parser that can only fail on it
+    if b"%PDF" in raw[:1024]:
         text = safe_extract_text_from_pdf(raw)
         if text:
             return text
-    if name.endswith(".docx") or name.endswith(".doc"):
+    elif raw.startswith(b"PK\x03\x04"):  # DOCX is a zip container
         text = safe_extract_text_from_docx(raw)
         if text:
             return text
-    try:
-        return raw.decode("utf-8", errors="ignore")
-    except Exception:
-        try:
-            return raw.decode("latin-1", errors="ignore")
-        except Exception:
-            return ""
+    # errors="ignore" cannot raise, so one decode is enough
+    return raw.decode("utf-8", errors="ignore")
+
+def extract_text_from_uploaded(uploaded_file):
+    if uploaded_file is None:
+        return ""
+    raw = uploaded_file.getvalue()
+    file_id = getattr(uploaded_file, "file_id", None)
+    return _cached_extract((file_id, len(raw)) if file_id else raw, raw)
 
 # -------------------------
 # Text normalization & tokenization
 # -------------------------
 TOKEN_RE = re.compile(r"\b[a-zA-Z\+\#0-9\-]+\b")
-
+# ASCII fast path for TOKEN_RE: bytes that can't be part of a token become spaces.
+# Only valid without "_" ("_" is a \w char, so it changes where \b falls).
+_TOKEN_BYTES = bytes(c if c < 128 and (chr(c).isalnum() or chr(c) in "+#-") else 32 for c in range(256))
+_QUANT_RE = re.compile(r"\b\d{1,3}%|\b\d{2,5}\b")
+_WORD_RE = re.compile(r"\S+")
+_EDGE_PUNCT_RE = re.compile(r'^[^a-z0-9]+|[^a-z0-9]+$')
+
+# section / ATS / contact heuristics
+_SUMMARY_RE = re.compile(r'\bsummary\b|\babout\b|\bprofile\b')
+_EDUCATION_RE = re.compile(r'\beducation\b|\bdegree\b|\bgraduat')
+_EXPERIENCE_RE = re.compile(r'\bexperience\b|\bwork history\b|\bemployment\b|\bprojects\b')
+_ATS_COMBINED_RE = re.compile(r"(?P<cols>\t| {4,})|(?P<img><img|image:)|(?P<bullet>[■♦▸►✦])", re.I)
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"(?<!\d)(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{2,4}\)?[-.\s]?)?\d{6,10}(?!\d)")
+_ADDRESS_RE = re.compile(r"\b(city|state|province|street|road|ave|avenue|lane|pune|mumbai|delhi|bangalore|hyderabad)\b")
+_PINCODE_RE = re.compile(r"\b\d{5,6}\b")
+_URL_RE = re.compile(r"https?://(www\.)?[a-z0-9\-_]+\.[a-z]{2,}")
+_POSITIVE_TONE_RE = re.compile(r"achieved|improved", re.I)
+_JD_TITLE_RE = re.compile(r'\b(java developer|software engineer|developer|backend engineer)\b')
+_JAVA_DEV_RE = re.compile(r'\bjava developer\b')
+_JD_DEGREE_RE = re.compile(r'\bbachelor\b|\b(bsc|bachelor of)\b|\bengineering\b')
+_RESUME_DEGREE_RE = re.compile(r'\bbachelor\b|\bbsc\b|\bengineering\b')
+
+@lru_cache(maxsize=4096)
 def normalize_word(w: str):
     w = w.lower()
-    w = re.sub(r'^[^a-z0-9]+|[^a-z0-9]+$', '', w)
+    w = _EDGE_PUNCT_RE.sub('', w)
     for suf in ('ings','ing','ed','es','s'):
         if w.endswith(suf) and len(w) - len(suf) >= 2:
             return w[: -len(suf)]
     return w
 
-def tokenize(text: str):
+def _first_nonblank(s: str, max_scan: int = 4096):
+    # the opener sits near the top, so only look at the first few KB
+    i = 0
+    n = min(len(s), max_scan)
+    while i < n:
+        j = s.find("\n", i, n)
+        if j == -1:
+            j = n
+        line = s[i:j].strip()
+        if line:
+            return line
+        i = j + 1
+    return ""
+
+def first_line_and_word_count(text: str):
+    return _first_nonblank(text), sum(1 for _ in _WORD_RE.finditer(text))
+
+@lru_cache(maxsize=32)
+def tokenize(text: str, _find=TOKEN_RE.findall, _norm=normalize_word, _stop=STOPWORDS):
+    # cached per text, so the result is an immutable tuple; tokens are
+    # lowercased one at a time by normalize_word, never the whole text
     if not text:
-        return []
-    tokens = TOKEN_RE.findall(text)
-    norm = [normalize_word(t) for t in tokens if t]
-    filtered = [t for t in norm if t and t not in STOPWORDS and len(t) >= 2]
-    return filtered
+        return ()
+    if text.isascii() and "_" not in text:
+        # byte-level translate + split is several times faster than findall here;
+        # normalize_word strips the edge punctuation \b would have excluded
+        raw = text.encode("ascii").translate(_TOKEN_BYTES).decode("ascii").split()
+    else:
+        raw = _find(text)
+    norm = (_norm(t) for t in raw)
+    return tuple(t for t in norm if len(t) >= 2 and t not in _stop)
 
 # -------------------------
 # Section detection heuristics
 # -------------------------
 def detect_sections(text: str):
     lowered = text.lower()
-    has_summary = bool(re.search(r'\bsummary\b|\babout\b|\bprofile\b', lowered))
-    has_education = bool(re.search(r'\beducation\b|\bdegree\b|\bgraduat', lowered))
-    has_experience = bool(re.search(r'\bexperience\b|\bwork history\b|\bemployment\b|\bprojects\b', lowered))
+    has_summary = bool(_SUMMARY_RE.search(lowered))
+    has_education = bool(_EDUCATION_RE.search(lowered))
+    has_experience = bool(_EXPERIENCE_RE.search(lowered))
     return {"summary": has_summary, "education": has_education, "experience": has_experience}
 
 # -------------------------
 # Simple ATS checks
 # -------------------------
+@lru_cache(maxsize=32)
 def simple_ats_checks(resume_text: str):
     issues = []
     if not resume_text:
-        return issues
-    if "\t" in resume_text or re.search(r' {4,}', resume_text):
+        return ()
+    # one pass over the text for all pattern checks; stop once every flag is seen
+    seen = set()
+    for m in _ATS_COMBINED_RE.finditer(resume_text):
+        seen.add(m.lastgroup)
+        if len(seen) == 3:
+            break
+    if "cols" in seen:
         issues.append("Possible columns or table-like formatting — convert to a simple vertical layout.")
-    if "<img" in resume_text.lower() or "image:" in resume_text.lower():
+    if "img" in seen:
         issues.append("Images detected — remove images for ATS-friendly resume.")
-    if re.search(r"[■♦▸►✦]", resume_text):
+    if "bullet" in seen:
         issues.append("Unusual bullet characters detected — use simple hyphens or standard bullets.")
-    words = len(resume_text.split())
+    words = sum(1 for _ in itertools.islice(_WORD_RE.finditer(resume_text), 200))
     if words < 200:
         issues.append("Resume looks short — aim for ~400–1000 words depending on experience.")
-    return issues
+    return tuple(issues)
 
 def detect_contact_info(resume_text: str):
     info = {"email": False, "phone": False, "address": False, "linkedin": False, "website": False}
     if not resume_text:
         return info
-    if re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", resume_text):
+    if _EMAIL_RE.search(resume_text):
         info["email"] = True
-    if re.search(r"(?<!\d)(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{2,4}\)?[-.\s]?)?\d{6,10}(?!\d)", resume_text):
+    if _PHONE_RE.search(resume_text):
         info["phone"] = True
-    if re.search(r"\b(city|state|province|street|road|ave|avenue|lane|pune|mumbai|delhi|bangalore|hyderabad)\b", resume_text.lower()) or re.search(r"\b\d{5,6}\b", resume_text):
+    lowered = resume_text.lower()
+    if _ADDRESS_RE.search(lowered) or _PINCODE_RE.search(resume_text):
         info["address"] = True
-    if "linkedin.com" in resume_text.lower():
+    if "linkedin.com" in lowered:
         info["linkedin"] = True
-    if re.search(r"https?://(www\.)?[a-z0-9\-_]+\.[a-z]{2,}", resume_text.lower()):
+    if _URL_RE.search(lowered):
         info["website"] = True
     return info
 
 # -------------------------
 # Keyword extraction & scoring
 # -------------------------
-def extract_top_terms(text: str, top_n=100):
-    toks = tokenize(text)
-    if not toks:
-        return [], {}
-    counts = Counter(toks)
+def top_terms_from_counter(counts, top_n=100):
     most = counts.most_common(top_n)
     return [w for w, c in most], {w: c for w, c in most}
 
-def categorize_and_compare(resume_text: str, jd_text: str):
-    jd_tokens = tokenize(jd_text)
-    r_tokens = tokenize(resume_text)
+@lru_cache(maxsize=16)
+def _term_counter(text: str):
+    # shared across calls with different top_n; callers must not mutate it
+    return Counter(tokenize(text))
+
+def extract_top_terms(text: str, top_n=100):
+    counts = _term_counter(text)
+    if not counts:
+        return [], {}
+    return top_terms_from_counter(counts, top_n)
+
+def categorize_and_compare(r_tokens, jd_tokens):
     jd_counts = Counter(jd_tokens)
     r_counts = Counter(r_tokens)
 
-    hard_req = {w for w in HARD_SKILLS if any(part in " ".join(jd_tokens) for part in [w])}
-    soft_req = {w for w in SOFT_SKILLS if any(part in " ".join(jd_tokens) for part in [w])}
-    verb_req = {w for w in ACTION_VERBS if any(part in " ".join(jd_tokens) for part in [w])}
+    jd_joined = " ".join(jd_tokens)
+    hard_req = {w for w in HARD_SKILLS if w in jd_joined}
+    soft_req = {w for w in SOFT_SKILLS if w in jd_joined}
+    verb_req = {w for w in ACTION_VERBS if w in jd_joined}
 
     def present_set(req_set, source_counts):
         present = {}
@@ -234,9 +461,11 @@ def categorize_and_compare(resume_text: str, jd_text: str):
     soft_matched, soft_missing = present_set(soft_req, r_counts)
     verb_matched, verb_missing = present_set(verb_req, r_counts)
 
-    jd_top, jd_freq = extract_top_terms(jd_text, top_n=150)
-    matched_simple = [t for t in jd_top if t in r_counts]
-    missing_simple = [t for t in jd_top if t not in r_counts]
+    jd_top, jd_freq = top_terms_from_counter(jd_counts, top_n=150) if jd_counts else ([], {})
+    # jd_top is already frequency-ordered, so one pass keeps both lists in order
+    matched_simple, missing_simple = [], []
+    for t in jd_top:
+        (matched_simple if t in r_counts else missing_simple).append(t)
 
     return {
         "hard": {"matched": hard_matched, "missing": hard_missing},
@@ -262,37 +491,40 @@ def compute_weighted_score(cat_compare):
     score_pct = base / (w_hard + w_soft + w_verb) * 100
     return round(score_pct, 2)
 
-def compute_similarity_score(resume_text: str, jd_text: str):
+def counter_cosine(r_ctr, j_ctr):
+    # only terms present on both sides contribute to the dot product
+    small, big = (r_ctr, j_ctr) if len(r_ctr) < len(j_ctr) else (j_ctr, r_ctr)
+    dot = sum(c * big.get(t, 0) for t, c in small.items())
+    nr = math.sqrt(sum(c * c for c in r_ctr.values()))
+    nj = math.sqrt(sum(c * c for c in j_ctr.values()))
+    return dot / (nr * nj) if nr and nj else 0.0
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _tfidf_similarity(resume_text: str, jd_text: str):
+    # re-scanning the same resume/JD pair skips refitting the vectorizer
+    TfidfVectorizer = _get_sklearn()
+    if not TfidfVectorizer:
+        return None
+    try:
+        vec = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b", lowercase=True)
+        mats = vec.fit_transform([resume_text, jd_text])
+        # rows are already L2-normalized, so the sparse dot product is the cosine
+        sim = mats[0].dot(mats[1].T)[0, 0]
+        return round(float(sim) * 100, 2)
+    except Exception:
+        return None
+
+def compute_similarity_score(resume_text: str, jd_text: str, r_tokens=None, j_tokens=None):
     if not resume_text or not jd_text:
         return 0.0
-    if SKLEARN_AVAILABLE:
-        try:
-            vec = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b", lowercase=True)
-            mats = vec.fit_transform([resume_text, jd_text])
-            sim = cosine_similarity(mats[0:1], mats[1:2])[0][0]
-            return round(float(sim) * 100, 2)
-        except Exception:
-            pass
-    r_tokens = tokenize(resume_text)
-    j_tokens = tokenize(jd_text)
-    vocab = sorted(set(r_tokens + j_tokens))
-    if not vocab:
-        return 0.0
-    v_index = {w: i for i, w in enumerate(vocab)}
-    def build_vec(tokens):
-        v = np.zeros(len(vocab), dtype=float)
-        for t in tokens:
-            v[v_index[t]] += 1.0
-        if np.linalg.norm(v) > 0:
-            return v / np.linalg.norm(v)
-        return v
-    rvec = build_vec(r_tokens)
-    jvec = build_vec(j_tokens)
-    denom = (np.linalg.norm(rvec) * np.linalg.norm(jvec))
-    if denom == 0:
-        return 0.0
-    sim = float(np.dot(rvec, jvec))
-    return round(sim * 100, 2)
+    sim = _tfidf_similarity(resume_text, jd_text)
+    if sim is not None:
+        return sim
+    if r_tokens is None:
+        r_tokens = tokenize(resume_text)
+    if j_tokens is None:
+        j_tokens = tokenize(jd_text)
+    return round(counter_cosine(Counter(r_tokens), Counter(j_tokens)) * 100, 2)
 
 # -------------------------
 # Recruiter tips & helpers
@@ -309,18 +541,17 @@ def generate_recruiter_tips(resume_text: str, jd_text: str, cat_compare, section
         tips.append("Add a 2–3 line Summary at the top describing your role and impact.")
     if not sections["experience"]:
         tips.append("Add at least one Work Experience entry (internship or project counts).")
-    jd_title_match = bool(re.search(r'\b(java developer|software engineer|developer|backend engineer)\b', jd_text.lower()))
-    if jd_title_match and not re.search(r'\bjava developer\b', resume_text.lower()):
+    jd_title_match = bool(_JD_TITLE_RE.search(jd_text.lower()))
+    if jd_title_match and not _JAVA_DEV_RE.search(resume_text.lower()):
         tips.append("Include the exact job title (e.g. 'Java Developer') in your Summary or Experience for better matches.")
-    if re.search(r'\bbachelor\b|\b(bsc|bachelor of)\b|\bengineering\b', jd_text.lower()) and not re.search(r'\bbachelor\b|\bbsc\b|\bengineering\b', resume_text.lower()):
+    if _JD_DEGREE_RE.search(jd_text.lower()) and not _RESUME_DEGREE_RE.search(resume_text.lower()):
         tips.append("The JD prefers a Bachelor's degree — if you have relevant education, highlight it in Summary.")
-    nums = re.findall(r"\b\d{1,3}%|\b\d{2,5}\b", resume_text)
-    if not nums:
+    if not _QUANT_RE.search(resume_text):
         tips.append("Add measurable results (numbers, %, time saved, users served) to at least some bullets.")
     ats = simple_ats_checks(resume_text)
     if ats:
         tips.append("Formatting suggestions: " + " | ".join(ats))
-    top_missing = list(cat_compare["hard"]["missing"].keys())[:6] if cat_compare["hard"]["missing"] else cat_compare["missing_simple"][:6]
+    top_missing = list(itertools.islice(cat_compare["hard"]["missing"], 6)) if cat_compare["hard"]["missing"] else cat_compare["missing_simple"][:6]
     if top_missing:
         tips.append("Top missing skills to add: " + ", ".join(top_missing))
     if score_pct >= 80:
@@ -333,12 +564,6 @@ def generate_recruiter_tips(resume_text: str, jd_text: str, cat_compare, section
         tips.insert(0, "Low match — rework resume to include role-specific skills and structure.")
     return tips
 
-def get_download_link(text, filename="extracted_resume.txt"):
-    if not text:
-        return ""
-    b64 = base64.b64encode(text.encode()).decode()
-    return f'<a href="data:file/txt;base64,{b64}" download="{filename}">Download extracted text</a>'
-
 def render_chip_html(label, count, color="#f0f0f0", link_id=None):
     style = f"background:{color}; padding:10px 14px; border-radius:10px; font-weight:700; display:inline-block; cursor:pointer; margin-right:12px; text-align:center;"
     if link_id:
@@ -348,73 +573,72 @@ def render_chip_html(label, count, color="#f0f0f0", link_id=None):
 # -------------------------
 # Top CSS (responsive purple buttons, centered text)
 # -------------------------
-st.markdown("""
-<style>
-:root { --purple: #6c63ff; --purple-2: #5a54e6; }
-body { font-family: Inter, Arial, sans-serif; }
-div.stButton > button { background-color: var(--purple) !important; color: white !important; padding: 10px 18px !important; border-radius:10px !important; border:none !important; font-weight:700 !important; font-size:16px !important; min-width:120px; }
-div.stButton > button:hover { filter: brightness(0.98); transform: translateY(-1px); }
-.content-wrap { max-width:1150px; margin:20px auto; padding: 12px; }
-.center-card { text-align:center; padding:22px; background:#fbfcff; border-radius:12px; border:1px solid #eef2ff; }
-.metric-row { display:flex; gap:12px; flex-wrap:wrap; justify-content:center; margin-bottom:16px; }
-.section-box { padding:14px; border-radius:10px; border:1px solid #eee; background:#fff; margin-bottom:12px; box-shadow: 0 1px 6px rgba(20,20,20,0.03); }
-.kv { font-weight:700; margin-bottom:6px; font-size:15px; }
-.small { color:#666; font-size:14px; }
-.score-circle { width:120px; height:120px; border-radius:50%; background:var(--purple); color:white; display:flex; align-items:center; justify-content:center; font-weight:800; font-size:28px; margin:12px auto; box-shadow: 0 6px 18px rgba(108,99,255,0.18); }
-@media (max-width: 720px) {
-  div.stButton > button { font-size:15px !important; padding:10px !important; }
-  .score-circle { width:100px; height:100px; font-size:24px; }
-}
-table.skills { width:100%; border-collapse:collapse; margin-top:8px;}
-table.skills th, table.skills td { border:1px solid #eee; padding:8px; text-align:left; vertical-align:top; font-size:14px;}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _load_css():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "app.css"), encoding="utf-8") as fh:
+        return f"<style>\n{fh.read()}</style>"
+
+st.markdown(_load_css(), unsafe_allow_html=True)
 
 # -------------------------
 # Header / Nav
 # -------------------------
+_NAV_ITEMS = (("HOME","home"), ("Scanner","scanner"), ("Results","results"), ("Dashboard","dashboard"),
+              ("Cover Letter","cover_letter"), ("LinkedIn","linkedin"), ("Job Tracker","job_tracker"), ("Account","account"))
+
+@st.cache_resource
+def _logo_path():
+    # checked once per process instead of a filesystem stat on every rerun
+    return "logo.png" if os.path.exists("logo.png") else None
+
 cols = st.columns([1, 6, 1])
 with cols[0]:
-    logo_path = "logo.png"
-    if os.path.exists(logo_path):
+    logo_path = _logo_path()
+    if logo_path:
         st.image(logo_path, width=56)
     else:
         st.write("")
 with cols[1]:
-    nav_items = [("HOME","home"), ("Scanner","scanner"), ("Results","results"), ("Dashboard","dashboard"),
-                 ("Cover Letter","cover_letter"), ("LinkedIn","linkedin"), ("Job Tracker","job_tracker"), ("Account","account")]
-    nav_cols = st.columns([1]*len(nav_items))
-    for i, (label, key) in enumerate(nav_items):
+    nav_cols = st.columns(len(_NAV_ITEMS))
+    for i, (label, key) in enumerate(_NAV_ITEMS):
         with nav_cols[i]:
             if st.button(label, key=f"nav_{key}"):
                 st.session_state.page = key
 with cols[2]:
     st.write("")
 
+_SKILL_COUNT_TPL = "{} ({})".format
+
+# circumference of r=54 is ~339.3; the arc length encodes the score
+_SCORE_SVG = (
+    '<svg width="100%" height="100%" viewBox="0 0 120 120">'
+    '<circle cx="60" cy="60" r="54" fill="none" stroke="#eef2ff" stroke-width="12"/>'
+    '<circle cx="60" cy="60" r="54" fill="none" stroke="#6c63ff" stroke-width="12" stroke-linecap="round" '
+    'stroke-dasharray="{dash:.1f} 339.3" transform="rotate(-90 60 60)"/>'
+    '<text x="60" y="68" text-anchor="middle" font-size="24" font-weight="800" fill="#6c63ff">{label}%</text>'
+    '</svg>'
+)
+
+def circular_score_html(score):
+    sc = max(0.0, min(100.0, float(score)))
+    return _SCORE_SVG.format(dash=339.3 * sc / 100, label=score)
+
 def render_result_block(r):
-    st.markdown('<div class="metric-row">', unsafe_allow_html=True)
-    st.markdown(f'<div class="score-circle">{r["score"]}%</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-row"><div class="score-circle">{circular_score_html(r["score"])}</div></div>', unsafe_allow_html=True)
 
-    st.markdown('<div id="section-overview" class="section-box">', unsafe_allow_html=True)
-    st.markdown(f"<div style='display:flex; justify-content:space-between; align-items:center'><div><div style='font-size:20px; font-weight:800'>{r['score']}%</div><div class='small'>Overall Match Score</div></div><div class='small'>Scored using keyword coverage & document similarity</div></div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(f"""<div id="section-overview" class="section-box">
+<div style='display:flex; justify-content:space-between; align-items:center'><div><div style='font-size:20px; font-weight:800'>{r['score']}%</div><div class='small'>Overall Match Score</div></div><div class='small'>Scored using keyword coverage & document similarity</div></div>
+</div>""", unsafe_allow_html=True)
 
     st.markdown('<div id="section-search" class="section-box">', unsafe_allow_html=True)
     st.markdown("<div style='font-weight:700; margin-bottom:6px;'>Searchability</div>", unsafe_allow_html=True)
     ci = r["contact_info"]
-    if ci["address"]:
-        st.markdown("<div class='badge-good'>Address found</div>", unsafe_allow_html=True)
-    else:
-        st.markdown("<div class='badge-bad'>Address not found — add city or full address</div>", unsafe_allow_html=True)
-    if ci["email"]:
-        st.markdown("<div class='badge-good'>Email found</div>", unsafe_allow_html=True)
-    else:
-        st.markdown("<div class='badge-bad'>Email missing</div>", unsafe_allow_html=True)
-    if ci["phone"]:
-        st.markdown("<div class='badge-good'>Phone number found</div>", unsafe_allow_html=True)
-    else:
-        st.markdown("<div class='badge-bad'>Phone missing</div>", unsafe_allow_html=True)
+    badges = [
+        "<div class='badge-good'>Address found</div>" if ci["address"] else "<div class='badge-bad'>Address not found — add city or full address</div>",
+        "<div class='badge-good'>Email found</div>" if ci["email"] else "<div class='badge-bad'>Email missing</div>",
+        "<div class='badge-good'>Phone number found</div>" if ci["phone"] else "<div class='badge-bad'>Phone missing</div>",
+    ]
+    st.markdown("".join(badges), unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="section-box">', unsafe_allow_html=True)
@@ -423,27 +647,27 @@ def render_result_block(r):
     soft = r["cat"]["soft"]
     if hard["matched"]:
         st.markdown("<div class='kv'>Matched technical skills</div>", unsafe_allow_html=True)
-        st.write(", ".join([f"{k} ({v})" for k, v in hard["matched"].items()]))
+        st.write(", ".join(itertools.starmap(_SKILL_COUNT_TPL, hard["matched"].items())))
     if hard["missing"]:
         st.markdown("<div style='margin-top:8px; font-weight:600'>Top missing technical skills</div>", unsafe_allow_html=True)
-        st.write(", ".join(list(hard["missing"].keys())[:12]))
+        st.write(", ".join(itertools.islice(hard["missing"], 12)))
     if soft["matched"]:
         st.markdown("<div style='margin-top:10px' class='kv'>Matched soft skills</div>", unsafe_allow_html=True)
-        st.write(", ".join(list(soft["matched"].keys())))
+        st.write(", ".join(soft["matched"]))
     if soft["missing"]:
         st.markdown("<div style='margin-top:8px; font-weight:600'>Missing soft skills</div>", unsafe_allow_html=True)
-        st.write(", ".join(list(soft["missing"].keys())[:8]))
+        st.write(", ".join(itertools.islice(soft["missing"], 8)))
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="section-box">', unsafe_allow_html=True)
     st.markdown("<div style='font-weight:700; margin-bottom:6px;'>Recruiter Tips</div>", unsafe_allow_html=True)
-    for t in r["suggestions"]:
-        st.write("• " + t)
+    if r["suggestions"]:
+        st.markdown("\n\n".join("• " + t for t in r["suggestions"]))
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="section-box">', unsafe_allow_html=True)
     st.markdown("<div style='font-weight:700; margin-bottom:6px;'>Formatting</div>", unsafe_allow_html=True)
-    fm = simple_ats_checks(r["full_resume"])
+    fm = r["ats_issues"]
     if fm:
         for f in fm:
             st.warning(f)
@@ -456,11 +680,8 @@ def render_result_block(r):
     jd_freq = r["cat"]["jd_freq"]
     r_counts = r["cat"]["r_counts"]
     jd_top = sorted(jd_freq.items(), key=lambda x: -x[1])[:20]
-    st.markdown("<table class='skills'><tr><th>Skill/Term</th><th>Resume count</th><th>JD count</th></tr>", unsafe_allow_html=True)
-    for term, jdcount in jd_top:
-        rc = r_counts.get(term, 0)
-        st.markdown(f"<tr><td>{term}</td><td>{rc}</td><td>{jdcount}</td></tr>", unsafe_allow_html=True)
-    st.markdown("</table>", unsafe_allow_html=True)
+    rows_html = "".join(f"<tr><td>{term}</td><td>{r_counts.get(term, 0)}</td><td>{jdcount}</td></tr>" for term, jdcount in jd_top)
+    st.markdown(f"<table class='skills'><tr><th>Skill/Term</th><th>Resume count</th><th>JD count</th></tr>{rows_html}</table>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="section-box">', unsafe_allow_html=True)
@@ -469,154 +690,180 @@ def render_result_block(r):
     st.markdown(f"• Summary section: <b>{'Found' if secs['summary'] else 'Missing'}</b>", unsafe_allow_html=True)
     st.markdown(f"• Work Experience section: <b>{'Found' if secs['experience'] else 'Missing'}</b>", unsafe_allow_html=True)
     st.markdown(f"• Education section: <b>{'Found' if secs['education'] else 'Missing'}</b>", unsafe_allow_html=True)
-    quant_found = re.findall(r"\b\d{1,3}%|\b\d{2,5}\b", r['full_resume'])
-    st.markdown(f"• Measurable results found: <b>{len(quant_found)}</b>", unsafe_allow_html=True)
-    tone_flag = "Positive" if "achieved" in r["full_resume"].lower() or "improved" in r["full_resume"].lower() else "Neutral"
+    st.markdown(f"• Measurable results found: <b>{r['quant_count']}</b>", unsafe_allow_html=True)
+    tone_flag = "Positive" if _POSITIVE_TONE_RE.search(r["full_resume"]) else "Neutral"
     st.markdown(f"• Resume tone: <b>{tone_flag}</b>", unsafe_allow_html=True)
     st.markdown(f"• LinkedIn: <b>{'Found' if r['contact_info']['linkedin'] else 'Not found'}</b>", unsafe_allow_html=True)
-    st.markdown(f"• Word count: <b>{len(r['full_resume'].split())}</b>", unsafe_allow_html=True)
+    st.markdown(f"• Word count: <b>{r['word_count']}</b>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="section-box">', unsafe_allow_html=True)
     st.markdown("<div style='font-weight:700; margin-bottom:6px;'>Resume excerpt</div>", unsafe_allow_html=True)
-    st.code(r.get("resume_excerpt", "")[:8000])
-    dl = get_download_link(r.get("resume_excerpt",""), filename="extracted_resume.txt")
-    if dl:
-        st.markdown(dl, unsafe_allow_html=True)
+    full = r.get("full_resume", "")
+    excerpt = f"{full[:3000]}..." if len(full) > 3000 else full
+    st.code(excerpt)
+    if excerpt:
+        st.download_button("Download extracted text", data=excerpt.encode(), file_name="extracted_resume.txt", mime="text/plain")
     st.markdown("</div>", unsafe_allow_html=True)
 
 # -------------------------
 # Pages
 # -------------------------
+@contextmanager
+def content_wrap(anchor):
+    st.markdown(f'<div id="section-{anchor}"></div><div class="content-wrap">', unsafe_allow_html=True)
+    yield
+    st.markdown('</div>', unsafe_allow_html=True)
+
 def page_home():
-    st.markdown('<div id="section-home"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.markdown('<div class="center-card">', unsafe_allow_html=True)
-    st.markdown("<h1 style='margin-bottom:6px'>Welcome — Resume Analyzer Pro</h1>", unsafe_allow_html=True)
-    st.markdown("<p class='small'>Upload or paste your resume and paste the Job Description (JD) you want to apply for. Click <strong>Scanner</strong> in the top nav to start.</p>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    with content_wrap("home"):
+        st.markdown('<div class="center-card">', unsafe_allow_html=True)
+        st.markdown("<h1 style='margin-bottom:6px'>Welcome — Resume Analyzer Pro</h1>", unsafe_allow_html=True)
+        st.markdown("<p class='small'>Upload or paste your resume and paste the Job Description (JD) you want to apply for. Click <strong>Scanner</strong> in the top nav to start.</p>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
 def page_scanner():
-    st.markdown('<div id="section-scanner"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Scanner — Upload Resume & Paste Job Description")
-    left, right = st.columns([1,1])
-    with left:
-        st.markdown("**Upload Resume (PDF/DOCX/TXT)**")
-        uploaded = st.file_uploader("", type=["pdf","docx","doc","txt"], key="u_resume")
-        st.markdown("---")
-        st.markdown("**Or paste resume text (optional)**")
-        resume_text_manual = st.text_area("", height=260, key="paste_resume_area", value=st.session_state.get("paste_resume",""))
-        st.session_state.paste_resume = resume_text_manual or ""
-    with right:
-        st.markdown("**Paste Job Description (JD)**")
-        jd_text = st.text_area("", height=260, key="paste_jd_area", value=st.session_state.get("paste_jd",""))
-        st.session_state.paste_jd = jd_text or ""
-        st.markdown("---")
-        st.markdown("Options")
-        ck_linkedin = st.checkbox("Also show LinkedIn suggestions", value=False, key="opt_linkedin")
-    st.markdown("")
-
-    # Scan button: run analysis inline (no rerun)
-    if st.button("Scan / Analyze", key="do_scan"):
-        if uploaded:
-            rtext = extract_text_from_uploaded(uploaded) or ""
-            uploaded_name = uploaded.name
-        else:
-            rtext = (st.session_state.get("paste_resume","") or "").strip()
-            uploaded_name = "pasted_resume.txt"
-        jd_val = (st.session_state.get("paste_jd","") or "").strip()
-        if not rtext:
-            st.warning("Please provide resume text by uploading a file or pasting it.")
-            return
-        if not jd_val:
-            st.warning("Please paste a job description to compare.")
-            return
-
-        sections = detect_sections(rtext)
-        contact_info = detect_contact_info(rtext)
-
-        cat = categorize_and_compare(rtext, jd_val)
-        weighted_score = compute_weighted_score(cat)
-        sim_score = compute_similarity_score(rtext, jd_val)
-        final_score = round((weighted_score * 0.7) + (sim_score * 0.3), 2)
-
-        searchability_issues = 0
-        if not contact_info["address"]:
-            searchability_issues += 1
-        if not contact_info["email"]:
-            searchability_issues += 1
-        if not contact_info["phone"]:
-            searchability_issues += 1
-
-        hard_issues = len(cat["hard"]["missing"]) if cat["hard"]["missing"] else len([m for m in cat["missing_simple"] if m in HARD_SKILLS])
-        soft_issues = len(cat["soft"]["missing"]) if cat["soft"]["missing"] else len([m for m in cat["missing_simple"] if m in SOFT_SKILLS])
-        formatting_issues = len(simple_ats_checks(rtext))
-
-        suggestions = generate_recruiter_tips(rtext, jd_val, cat, sections, contact_info, final_score)
-
-        result = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "score": final_score,
-            "sim_score": sim_score,
-            "weighted_score": weighted_score,
-            "searchability_issues": searchability_issues,
-            "hard_issues": hard_issues,
-            "soft_issues": soft_issues,
-            "recruiter_tips_count": len(suggestions),
-            "formatting_issues": formatting_issues,
-            "sections": sections,
-            "contact_info": contact_info,
-            "cat": cat,
-            "suggestions": suggestions,
-            "resume_excerpt": (rtext[:3000] + "...") if len(rtext) > 3000 else rtext,
-            "resume_name": uploaded_name,
-            "full_resume": rtext,
-            "full_jd": jd_val,
-            "linkedin_suggestions": ck_linkedin
-        }
-
-        st.session_state.current_result = result
-        st.session_state.scan_history.insert(0, result)
-        st.success("Scan complete — results below.")
-        render_result_block(result)
-
-    st.markdown("</div>", unsafe_allow_html=True)
+    ss = st.session_state
+    with content_wrap("scanner"):
+        st.header("Scanner — Upload Resume & Paste Job Description")
+        left, right = st.columns([1,1])
+        with left:
+            st.markdown("**Upload Resume (PDF/DOCX/TXT)**")
+            uploaded = st.file_uploader("", type=["pdf","docx","doc","txt"], key="u_resume")
+            st.markdown("---")
+            st.markdown("**Or paste resume text (optional)**")
+            resume_text_manual = st.text_area("", height=260, key="paste_resume_area", value=ss.get("paste_resume",""))
+            ss.paste_resume = resume_text_manual or ""
+        with right:
+            st.markdown("**Paste Job Description (JD)**")
+            jd_text = st.text_area("", height=260, key="paste_jd_area", value=ss.get("paste_jd",""))
+            ss.paste_jd = jd_text or ""
+            st.markdown("---")
+            st.markdown("Options")
+            ck_linkedin = st.checkbox("Also show LinkedIn suggestions", value=False, key="opt_linkedin")
+        st.markdown("")
+
+        # Scan button: run analysis inline (no rerun)
+        if st.button("Scan / Analyze", key="do_scan"):
+            if uploaded:
+                rtext = extract_text_from_uploaded(uploaded) or ""
+                uploaded_name = uploaded.name
+            else:
+                rtext = (ss.get("paste_resume","") or "").strip()
+                uploaded_name = "pasted_resume.txt"
+            jd_val = (ss.get("paste_jd","") or "").strip()
+            if not rtext:
+                st.warning("Please provide resume text by uploading a file or pasting it.")
+                return
+            if not jd_val:
+                st.warning("Please paste a job description to compare.")
+                return
+
+            sections = detect_sections(rtext)
+            contact_info = detect_contact_info(rtext)
+
+            r_tokens = tokenize(rtext)
+            j_tokens = tokenize(jd_val)
+            cat = categorize_and_compare(r_tokens, j_tokens)
+            weighted_score = compute_weighted_score(cat)
+            sim_score = compute_similarity_score(rtext, jd_val, r_tokens, j_tokens)
+            final_score = round((weighted_score * 0.7) + (sim_score * 0.3), 2)
+
+            searchability_issues = 0
+            if not contact_info["address"]:
+                searchability_issues += 1
+            if not contact_info["email"]:
+                searchability_issues += 1
+            if not contact_info["phone"]:
+                searchability_issues += 1
+
+            hard_issues = len(cat["hard"]["missing"]) if cat["hard"]["missing"] else len([m for m in cat["missing_simple"] if m in HARD_SKILLS])
+            soft_issues = len(cat["soft"]["missing"]) if cat["soft"]["missing"] else len([m for m in cat["missing_simple"] if m in SOFT_SKILLS])
+            # counts above need the full lists; only keep the head for storage
+            cat["matched_simple"] = cat["matched_simple"][:STORED_TERMS_LIMIT]
+            cat["missing_simple"] = cat["missing_simple"][:STORED_TERMS_LIMIT]
+            ats_issues = simple_ats_checks(rtext)
+            formatting_issues = len(ats_issues)
+
+            suggestions = generate_recruiter_tips(rtext, jd_val, cat, sections, contact_info, final_score)
+
+            result = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "score": final_score,
+                "sim_score": sim_score,
+                "weighted_score": weighted_score,
+                "searchability_issues": searchability_issues,
+                "hard_issues": hard_issues,
+                "soft_issues": soft_issues,
+                "recruiter_tips_count": len(suggestions),
+                "formatting_issues": formatting_issues,
+                "ats_issues": ats_issues,
+                "quant_count": sum(1 for _ in _QUANT_RE.finditer(rtext)),
+                "word_count": sum(1 for _ in _WORD_RE.finditer(rtext)),
+                "sections": sections,
+                "contact_info": contact_info,
+                "cat": cat,
+                "suggestions": suggestions,
+                "resume_name": uploaded_name,
+                "full_resume": rtext,
+                "full_jd": jd_val,
+                "linkedin_suggestions": ck_linkedin
+            }
+
+            ss.current_result = result
+            ss.scan_history.appendleft(result)
+            trim_scan_history()
+            st.success("Scan complete — results below.")
+            render_result_block(result)
 
 def page_results():
-    st.markdown('<div id="section-results"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Match Results")
-    r = st.session_state.get("current_result")
-    if not r:
-        st.info("No result to display. Run a scan first from the Scanner page.")
-    else:
-        render_result_block(r)
-    st.markdown("</div>", unsafe_allow_html=True)
+    with content_wrap("results"):
+        st.header("Match Results")
+        r = st.session_state.get("current_result")
+        if not r:
+            st.info("No result to display. Run a scan first from the Scanner page.")
+        else:
+            render_result_block(r)
 
 def page_dashboard():
-    st.markdown('<div id="section-dashboard"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Dashboard — Recent Scans")
-    history = st.session_state.get("scan_history", [])
-    if not history:
-        st.info("No scans yet. Run a scan on the Scanner page.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-    for item in history[:10]:
-        st.markdown("---")
-        st.write(f"**{item.get('resume_name','Resume')}** — {item.get('timestamp','')} — **{item.get('score')}%**")
-    st.markdown("</div>", unsafe_allow_html=True)
-
-def page_cover_letter():
-    st.markdown('<div id="section-cover_letter"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Cover Letter Analyzer")
-    st.markdown("Upload or paste cover letter and optional JD for tailored suggestions.")
+    with content_wrap("dashboard"):
+        st.header("Dashboard — Recent Scans")
+        history = st.session_state.get("scan_history", [])
+        tracked = st.session_state.get("tracker_history", [])
+        if not history and not tracked:
+            st.info("No scans yet. Run a scan on the Scanner page.")
+            return
+        if history:
+            show_all = st.session_state.get("_dash_show_all", False)
+            limit = 10 if show_all else 3
+            rows = []
+            for item in itertools.islice(history, limit):
+                name = item.get("resume_name") or "Resume"
+                ts = item.get("timestamp", "")
+                score = item.get("score")
+                rows.append(f"---\n**{name}** — {ts} — **{score}%**")
+            st.markdown("\n\n".join(rows))
+            if not show_all and len(history) > limit and st.button("Show more", key="dash_show_more"):
+                st.session_state._dash_show_all = True
+                st.rerun()
+        if tracked:
+            st.subheader("Tracked Applications")
+            rows = []
+            for job in itertools.islice(tracked, 10):
+                company = f" at *{job['company']}*" if job["company"] else ""
+                rows.append(f"---\n**{job['title']}**{company} — {job['date']} — {job['status']}")
+            st.markdown("\n\n".join(rows))
+
+# Fragments (Streamlit >= 1.33) rerun only their own widgets; older versions run the full page
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+@_fragment
+def _cover_form():
     cover_file = st.file_uploader("", type=["pdf","docx","doc","txt"], key="cover_u")
     cover_text = st.text_area("Paste cover letter text", height=220, key="cover_area", value=st.session_state.get("paste_cover_letter",""))
-    st.session_state.paste_cover_letter = cover_text or ""
+    new_val = cover_text or ""
+    if st.session_state.get("paste_cover_letter") != new_val:
+        st.session_state.paste_cover_letter = new_val
     cover_jd = st.text_area("Optional: Paste JD for contextual suggestions", height=160, key="cover_jd")
     if st.button("Analyze Cover Letter", key="analyze_cover"):
         if cover_file:
@@ -626,26 +873,37 @@ def page_cover_letter():
         if not ctext:
             st.warning("Please provide a cover letter.")
             return
-        tips = []
-        first_line = next((ln for ln in ctext.splitlines() if ln.strip()), "")
-        if not first_line or len(first_line.split()) < 6:
-            tips.append("Start with a one-line opener mentioning role & impact.")
-        if len(ctext.split()) < 180:
-            tips.append("Cover letter looks short — aim for ~200–350 words.")
-        if cover_jd and cover_jd.strip():
-            matched, _ = extract_top_terms(cover_jd, top_n=60)
-            tips.append("Consider aligning first paragraph with the JD's top keywords.")
+        has_jd = bool(cover_jd and cover_jd.strip())
+        h = hash((ctext, has_jd))
+        if st.session_state.get("_cover_tips_cache_h") == h:
+            tips = st.session_state["_cover_tips_cache_v"]
+        else:
+            tips = []
+            first_line, word_count = first_line_and_word_count(ctext)
+            if not first_line or len(first_line.split()) < 6:
+                tips.append("Start with a one-line opener mentioning role & impact.")
+            if word_count < 180:
+                tips.append("Cover letter looks short — aim for ~200–350 words.")
+            if has_jd:
+                tips.append("Consider aligning first paragraph with the JD's top keywords.")
+            st.session_state["_cover_tips_cache_h"] = h
+            st.session_state["_cover_tips_cache_v"] = tips
         st.success("Cover letter analysis complete.")
-        for t in tips:
-            st.write("• " + t)
-    st.markdown("</div>", unsafe_allow_html=True)
+        if tips:
+            st.markdown("\n\n".join("• " + t for t in tips))
 
-def page_linkedin():
-    st.markdown('<div id="section-linkedin"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("LinkedIn Optimizer")
+def page_cover_letter():
+    with content_wrap("cover_letter"):
+        st.header("Cover Letter Analyzer")
+        st.markdown("Upload or paste cover letter and optional JD for tailored suggestions.")
+        _cover_form()
+
+@_fragment
+def _linkedin_form():
     summary = st.text_area("Paste LinkedIn About summary", height=220, key="linkedin_area", value=st.session_state.get("paste_linkedin",""))
-    st.session_state.paste_linkedin = summary or ""
+    new_val = summary or ""
+    if st.session_state.get("paste_linkedin") != new_val:
+        st.session_state.paste_linkedin = new_val
     opt_jd = st.text_area("Optional JD (for context)", height=160, key="linkedin_jd_area")
     if st.button("Optimize LinkedIn", key="do_linkedin"):
         if not summary.strip():
@@ -654,74 +912,68 @@ def page_linkedin():
         suggestions = []
         suggestions.append("Start with role + one-line measurable impact.")
         if opt_jd and opt_jd.strip():
-            matched, _ = extract_top_terms(opt_jd, top_n=40)
             suggestions.append("Place top 4 job keywords within first two sentences of About.")
         st.success("LinkedIn suggestions ready.")
-        for s in suggestions:
-            st.write("• " + s)
-    st.markdown("</div>", unsafe_allow_html=True)
+        if suggestions:
+            st.markdown("\n\n".join("• " + s for s in suggestions))
+
+def page_linkedin():
+    with content_wrap("linkedin"):
+        st.header("LinkedIn Optimizer")
+        _linkedin_form()
 
 def page_tracker():
-    st.markdown('<div id="section-job_tracker"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Job Tracker")
-    title = st.text_input("Job title", key="t_title")
-    comp = st.text_input("Company", key="t_company")
-    date = st.date_input("Application date", key="t_date")
-    status = st.selectbox("Status", ["Applied","Interviewing","Offer","Rejected"], key="t_status")
-    if st.button("Add to Tracker", key="add_to_tracker"):
-        st.session_state.scan_history.insert(0, {"resume_name": title or "Untitled", "timestamp": date.isoformat(), "score": "Tracked", "note": comp, "status": status})
-        st.success("Added to tracker.")
-    st.markdown("</div>", unsafe_allow_html=True)
+    with content_wrap("job_tracker"):
+        st.header("Job Tracker")
+        title = st.text_input("Job title", key="t_title")
+        comp = st.text_input("Company", key="t_company")
+        date = st.date_input("Application date", key="t_date")
+        status = st.selectbox("Status", _STATUSES, key="t_status")
+        if st.button("Add to Tracker", key="add_to_tracker"):
+            st.session_state.tracker_history.appendleft({"title": title or "Untitled", "company": comp, "date": date.isoformat(), "status": status})
+            st.success("Added to tracker.")
 
 def page_account():
-    st.markdown('<div id="section-account"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="content-wrap">', unsafe_allow_html=True)
-    st.header("Account")
-    if st.session_state.get("user"):
-        st.success(f"Signed in as **{st.session_state.user.get('name')}** ({st.session_state.user.get('email')})")
-        if st.button("Logout", key="logout_btn"):
-            st.session_state.user = None
-            st.session_state.page = "home"
-            st.success("Logged out.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Accept-any-credentials behaviour (no DB)
-    st.subheader("Sign Up (optional)")
-    su_name = st.text_input("Full name", key="su_name")
-    su_email = st.text_input("Email", key="su_email")
-    su_pwd = st.text_input("Password (any)", type="password", key="su_pwd")
-    if st.button("Register", key="register_btn"):
-        st.session_state.user = {"name": su_name or "User", "email": su_email or ""}
-        st.success("Registered. You are signed in.")
-
-    st.markdown("---")
-    st.subheader("Login (press to continue)")
-    li_email = st.text_input("Email", key="li_email", value="")
-    li_pwd = st.text_input("Password (any)", type="password", key="li_pwd", value="")
-    if st.button("Login", key="login_btn"):
-        st.session_state.user = {"name": li_email.split("@")[0] if li_email else "User", "email": li_email}
-        st.success("Signed in.")
-    st.markdown("</div>", unsafe_allow_html=True)
+    ss = st.session_state
+    with content_wrap("account"):
+        st.header("Account")
+        if ss.get("user"):
+            st.success(f"Signed in as **{ss.user.get('name')}** ({ss.user.get('email')})")
+            if st.button("Logout", key="logout_btn"):
+                ss.user = None
+                ss.page = "home"
+                st.success("Logged out.")
+                st.stop()
+            return
+
+        # Accept-any-credentials behaviour (no DB)
+        st.subheader("Sign Up (optional)")
+        su_name = st.text_input("Full name", key="su_name")
+        su_email = st.text_input("Email", key="su_email")
+        su_pwd = st.text_input("Password (any)", type="password", key="su_pwd")
+        if st.button("Register", key="register_btn"):
+            ss.user = {"name": su_name or "User", "email": su_email or ""}
+            st.success("Registered. You are signed in.")
+            st.rerun()
+
+        st.markdown("---")
+        st.subheader("Login (press to continue)")
+        li_email = st.text_input("Email", key="li_email", value="")
+        li_pwd = st.text_input("Password (any)", type="password", key="li_pwd", value="")
+        if st.button("Login", key="login_btn"):
+            ss.user = {"name": li_email.split("@")[0] if li_email else "User", "email": li_email}
+            st.success("Signed in.")
+            st.rerun()
 
 # --- Router ---
-page = st.session_state.get("page", "home")
-if page == "home":
-    page_home()
-elif page == "scanner":
-    page_scanner()
-elif page == "results":
-    page_results()
-elif page == "dashboard":
-    page_dashboard()
-elif page == "cover_letter":
-    page_cover_letter()
-elif page == "linkedin":
-    page_linkedin()
-elif page == "job_tracker":
-    page_tracker()
-elif page == "account":
-    page_account()
-else:
-    page_home()
+_PAGES = {
+    "home": page_home,
+    "scanner": page_scanner,
+    "results": page_results,
+    "dashboard": page_dashboard,
+    "cover_letter": page_cover_letter,
+    "linkedin": page_linkedin,
+    "job_tracker": page_tracker,
+    "account": page_account,
+}
+_PAGES.get(st.session_state.get("page", "home"), page_home)()
@@ -1,35 +1,44 @@
 ### FILE: utils/auth.py
 # utils/auth.py
 import sqlite3
-from passlib.hash import bcrypt
-from utils.db import get_db
+from contextlib import closing
+from functools import lru_cache
+from utils.db import get_db, ensure_schema
 from sqlalchemy import text
 import streamlit as st
 
+@lru_cache(maxsize=1)
+def _bcrypt():
+    # passlib is only needed when someone registers or logs in
+    from passlib.hash import bcrypt
+    return bcrypt
+
 def register_user(name, email, password):
     """
     Insert a new user into DB. Returns (True, message) or (False, message).
     """
     db_type, db = get_db()
-    hashed = bcrypt.hash(password)
+    ensure_schema(db_type, db)
     if db_type == "postgres":
         engine = db
         with engine.begin() as conn:
             exists = conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": email}).fetchone()
             if exists:
                 return False, "Email already registered."
+            hashed = _bcrypt().hash(password)
             conn.execute(text("INSERT INTO users (name, email, password) VALUES (:name, :email, :pwd)"),
                          {"name": name, "email": email, "pwd": hashed})
             return True, "Registration successful."
     else:
-        conn = db
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM users WHERE email = ?", (email,))
-        if cur.fetchone():
-            return False, "Email already registered."
-        cur.execute("INSERT INTO users (name, email, password) VALUES (?, ?, ?)", (name, email, hashed))
-        conn.commit()
-        return True, "Registration successful."
+        with closing(db) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id FROM users WHERE email = ?", (email,))
+            if cur.fetchone():
+                return False, "Email already registered."
+            hashed = _bcrypt().hash(password)
+            cur.execute("INSERT INTO users (name, email, password) VALUES (?, ?, ?)", (name, email, hashed))
+            conn.commit()
+            return True, "Registration successful."
 
 
 def login_user(email, password):
@@ -38,6 +47,7 @@ def login_user(email, password):
     user_dict = {"id": id, "name": name, "email": email}
     """
     db_type, db = get_db()
+    ensure_schema(db_type, db)
     if db_type == "postgres":
         engine = db
         with engine.connect() as conn:
@@ -45,20 +55,20 @@ def login_user(email, password):
             if not row:
                 return False, "No such user."
             user_id, hashed, name = row
-            if bcrypt.verify(password, hashed):
+            if _bcrypt().verify(password, hashed):
                 return True, {"id": int(user_id), "name": name, "email": email}
             return False, "Invalid credentials."
     else:
-        conn = db
-        cur = conn.cursor()
-        cur.execute("SELECT id, password, name FROM users WHERE email = ?", (email,))
-        row = cur.fetchone()
-        if not row:
-            return False, "No such user."
-        user_id, hashed, name = row
-        if bcrypt.verify(password, hashed):
-            return True, {"id": int(user_id), "name": name, "email": email}
-        return False, "Invalid credentials."
+        with closing(db) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, password, name FROM users WHERE email = ?", (email,))
+            row = cur.fetchone()
+            if not row:
+                return False, "No such user."
+            user_id, hashed, name = row
+            if _bcrypt().verify(password, hashed):
+                return True, {"id": int(user_id), "name": name, "email": email}
+            return False, "Invalid credentials."
 
 
 # wrapper compatibility for previous naming
@@ -2,6 +2,7 @@
 # utils/db.py
 import os
 import sqlite3
+import threading
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
@@ -16,24 +17,57 @@ def _create_sqlite_dir():
     os.makedirs(os.path.dirname(SQLITE_PATH), exist_ok=True)
 
 
+_PG_ENGINE = None
+_PG_LOCK = threading.Lock()
+
+
+def _postgres_engine():
+    """
+    Returns the shared Postgres engine, or None if the server can't be reached.
+    Only an engine whose probe succeeded is kept; a failed probe is disposed
+    and retried on the next call instead of pinning the process to SQLite.
+    """
+    global _PG_ENGINE
+    if _PG_ENGINE is not None:
+        return _PG_ENGINE
+    with _PG_LOCK:
+        if _PG_ENGINE is None:
+            # SQLAlchemy expects postgresql:// not postgres:// in some environments
+            db_url = DATABASE_URL
+            if db_url.startswith("postgres://"):
+                db_url = db_url.replace("postgres://", "postgresql://", 1)
+            # the engine is reused for the life of the process, so its pool persists;
+            # pre_ping drops stale connections, recycle stays under typical idle timeouts
+            engine = create_engine(
+                db_url,
+                future=True,
+                pool_size=5,
+                max_overflow=10,
+                pool_pre_ping=True,
+                pool_recycle=1800,
+            )
+            try:
+                # quick test
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except OperationalError:
+                engine.dispose()
+                return None
+            _PG_ENGINE = engine
+    return _PG_ENGINE
+
+
 def get_db():
     """
     Returns a tuple ('postgres', engine) or ('sqlite', sqlite3.Connection)
+    The Postgres engine is shared across calls. SQLite gets a new connection
+    per call (caller closes it) so session threads never share a transaction.
     """
     if DATABASE_URL:
-        # SQLAlchemy expects postgresql:// not postgres:// in some environments
-        db_url = DATABASE_URL
-        if db_url.startswith("postgres://"):
-            db_url = db_url.replace("postgres://", "postgresql://", 1)
-        engine = create_engine(db_url, future=True)
-        try:
-            # quick test
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
+        engine = _postgres_engine()
+        if engine is not None:
             return "postgres", engine
-        except OperationalError:
-            # if postgres provided but cannot connect, fallback to sqlite
-            pass
+        # if postgres provided but cannot connect, fallback to sqlite
 
     # sqlite fallback
     _create_sqlite_dir()
@@ -41,12 +75,14 @@ def get_db():
     return "sqlite", conn
 
 
-def init_db():
+def init_db(db_type=None, db=None):
     """
     Create minimal tables automatically if they don't exist.
     Works for both Postgres (via SQLAlchemy) and SQLite.
+    Uses the given (db_type, db) pair, or get_db() when none is passed.
     """
-    db_type, db = get_db()
+    if db_type is None:
+        db_type, db = get_db()
     if db_type == "postgres":
         engine = db
         with engine.begin() as conn:
@@ -152,3 +188,21 @@ def init_db():
         )
         """)
         conn.commit()
+
+
+_SCHEMA_READY = set()
+_SCHEMA_LOCK = threading.Lock()
+
+
+def ensure_schema(db_type, db):
+    """
+    Run init_db() once per process for each backend; later calls are free.
+    Tracked per backend so a SQLite fallback doesn't skip the Postgres schema
+    once Postgres becomes reachable.
+    """
+    if db_type in _SCHEMA_READY:
+        return
+    with _SCHEMA_LOCK:
+        if db_type not in _SCHEMA_READY:
+            init_db(db_type, db)
+            _SCHEMA_READY.add(db_type)
@@ -1,57 +1,99 @@
 ### FILE: utils/extractor.py
 # utils/extractor.py
 from io import BytesIO
-try:
-    import docx  # from python-docx
-except Exception:
-    docx = None
-import PyPDF2
+from collections import OrderedDict
+import hashlib
+import threading
+from functools import lru_cache
 
-def extract_text_from_txt_bytes(fbytes: bytes):
+# PDF/DOCX libraries are imported on first use, not when the module loads
+@lru_cache(maxsize=1)
+def _get_docx():
     try:
-        return fbytes.decode("utf-8", errors="ignore")
+        import docx  # from python-docx
+        return docx
     except Exception:
-        return fbytes.decode("latin-1", errors="ignore")
+        return None
+
+@lru_cache(maxsize=1)
+def _get_pdf_reader():
+    try:
+        import pypdf as PyPDF2  # maintained successor, same PdfReader API
+    except Exception:
+        import PyPDF2
+    return PyPDF2.PdfReader
+
+def extract_text_from_txt_bytes(fbytes: bytes):
+    # errors="ignore" cannot raise, so one decode is enough
+    return fbytes.decode("utf-8", errors="ignore")
 
 def extract_text_from_docx_bytes(fbytes: bytes):
+    docx = _get_docx()
     if not docx:
         return extract_text_from_txt_bytes(fbytes)
     bio = BytesIO(fbytes)
     try:
         doc = docx.Document(bio)
-        paragraphs = [p.text for p in doc.paragraphs if p.text]
-        return "\n".join(paragraphs)
+        return "\n".join(p.text for p in doc.paragraphs if p.text)
     except Exception:
         return extract_text_from_txt_bytes(fbytes)
 
+def _page_texts(pages):
+    for page in pages:
+        try:
+            yield page.extract_text() or ""
+        except Exception:
+            continue
+
 def extract_text_from_pdf_bytes(fbytes: bytes):
-    bio = BytesIO(fbytes)
     try:
-        reader = PyPDF2.PdfReader(bio)
-        text_chunks = []
-        for page in reader.pages:
-            try:
-                text_chunks.append(page.extract_text() or "")
-            except Exception:
-                continue
-        return "\n".join(text_chunks)
+        reader = _get_pdf_reader()(BytesIO(fbytes))
+        if not reader.pages:
+            return ""
+        return "\n".join(_page_texts(reader.pages))
     except Exception:
         return ""
 
+# extracted text keyed by a blake2b digest of the bytes so the cache never holds raw file bytes
+_EXTRACT_CACHE = OrderedDict()
+_EXTRACT_CACHE_SIZE = 16
+_EXTRACT_CACHE_LOCK = threading.Lock()  # Streamlit sessions share this module across threads
+
+def _extract(raw: bytes):
+    # trust the magic bytes over the extension for mislabeled uploads;
+    # if the sniffed parser finds nothing, still try the bytes as text
+    text = ""
+    if b"%PDF" in raw[:1024]:
+        text = extract_text_from_pdf_bytes(raw)
+    elif raw.startswith(b"PK\x03\x04"):  # DOCX is a zip container
+        text = extract_text_from_docx_bytes(raw)
+    return text or extract_text_from_txt_bytes(raw)
+
 def extract_file_text(uploaded_file):
     """
     uploaded_file: streamlit uploaded_file object
     returns: text extracted (string)
+    Results are cached by a digest of the file bytes, so re-extracting the same upload is free.
     """
     if uploaded_file is None:
         return ""
-    name = uploaded_file.name.lower()
-    raw = uploaded_file.read()
-    if name.endswith(".txt"):
-        return extract_text_from_txt_bytes(raw)
-    if name.endswith(".pdf"):
-        return extract_text_from_pdf_bytes(raw)
-    if name.endswith(".docx") or name.endswith(".doc"):
-        return extract_text_from_docx_bytes(raw)
-    # fallback
-    return extract_text_from_txt_bytes(raw)
+    # getvalue() is idempotent on Streamlit's UploadedFile; read() drains the buffer
+    getvalue = getattr(uploaded_file, "getvalue", None)
+    if getvalue is not None:
+        raw = getvalue()
+    else:
+        uploaded_file.seek(0)
+        raw = uploaded_file.read()
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    with _EXTRACT_CACHE_LOCK:
+        text = _EXTRACT_CACHE.get(key)
+        if text is not None:
+            _EXTRACT_CACHE.move_to_end(key)
+            return text
+    # extract outside the lock so one slow PDF doesn't block other sessions
+    text = _extract(raw)
+    with _EXTRACT_CACHE_LOCK:
+        _EXTRACT_CACHE[key] = text
+        if len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE:
+            _EXTRACT_CACHE.popitem(last=False)
+    return text
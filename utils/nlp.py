@@ -1,56 +1,106 @@
 ### FILE: utils/nlp.py
 # utils/nlp.py
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+
+_WS_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b[a-z0-9\+\#\-\.]+\b')
+_ATS_RE = re.compile(r'(?P<cols>\t|  )|(?P<img><img|image:)', re.I)
+
+@lru_cache(maxsize=1)
+def _sklearn_text():
+    # sklearn is heavy to import; load it when the first score is computed
+    from sklearn.feature_extraction import text
+    return text
 
 def clean_text(s: str):
     if not s:
         return ""
     s = s.lower()
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = _WS_RE.sub(' ', s).strip()
     return s
 
+@lru_cache(maxsize=32)
+def _tokens(text: str):
+    # cached per text so resume/JD are only lowercased and scanned once
+    return tuple(_WORD_RE.findall(text.lower())) if text else ()
+
 def compute_match_score(resume_text: str, jd_text: str):
-    resume_text = clean_text(resume_text)
-    jd_text = clean_text(jd_text)
+    return _match_score_clean(clean_text(resume_text), clean_text(jd_text))
+
+def _match_score_clean(resume_text: str, jd_text: str):
+    # expects clean_text() output
     if not resume_text or not jd_text:
         return 0.0
-    vectorizer = TfidfVectorizer(stop_words='english')
+    vectorizer = _sklearn_text().TfidfVectorizer(stop_words='english')
     try:
         tfidf = vectorizer.fit_transform([resume_text, jd_text])
-        sim = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
+        # TF-IDF rows are L2-normalized, so the sparse dot product is the cosine
+        sim = tfidf[0].dot(tfidf[1].T)[0, 0]
         return round(float(sim) * 100, 2)
     except Exception:
         return 0.0
 
 def get_keywords(resume_text: str, jd_text: str, top_n=50):
-    r_words = set(re.findall(r'\b[a-z0-9\+\#\-\.]+\b', resume_text.lower()))
-    jd_words = set(re.findall(r'\b[a-z0-9\+\#\-\.]+\b', jd_text.lower()))
-    matched = sorted(list(jd_words & r_words))
-    missing = sorted(list(jd_words - r_words))
-    return matched[:top_n], missing[:top_n]
+    return _keywords_from_tokens(_tokens(resume_text), _tokens(jd_text), top_n)
+
+def _keywords_from_tokens(r_tokens, jd_tokens, top_n=50):
+    r_words = set(r_tokens)
+    # keep JD order (first mention) and stop once both lists are full
+    seen = set()
+    matched, missing = [], []
+    for w in jd_tokens:
+        if w in seen:
+            continue
+        seen.add(w)
+        bucket = matched if w in r_words else missing
+        if len(bucket) < top_n:
+            bucket.append(w)
+        elif len(matched) >= top_n and len(missing) >= top_n:
+            break
+    return matched, missing
 
 def simple_ats_checks(resume_text: str):
+    return list(_ats_checks(resume_text or ""))
+
+@lru_cache(maxsize=64)
+def _ats_checks(resume_text: str):
+    # cached per resume text, so tweaking only the JD never rescans the resume
     checks = []
     if not resume_text:
-        return checks
-    if "\t" in resume_text or "  " in resume_text:
+        return ()
+    # one pass for both pattern checks; stop once both have been seen
+    seen = set()
+    for m in _ATS_RE.finditer(resume_text):
+        seen.add(m.lastgroup)
+        if len(seen) == 2:
+            break
+    if "cols" in seen:
         checks.append("Possible columns or table-like formatting (avoid for ATS).")
-    if "<img" in resume_text or "image:" in resume_text.lower():
+    if "img" in seen:
         checks.append("Images detected or image tags present (remove images for ATS).")
     if len(resume_text.splitlines()) < 5:
         checks.append("Short resume text detected (check content).")
-    return checks
+    return tuple(checks)
 
 # higher-level helper used in app
 def analyze_resume_and_jd(resume_text: str, jd_text: str):
-    score = compute_match_score(resume_text, jd_text)
-    matched, missing = get_keywords(resume_text, jd_text, top_n=200)
-    warnings = simple_ats_checks(resume_text)
+    score, matched, missing, warnings = _analyze(resume_text or "", jd_text or "")
+    # fresh lists per call so callers can't mutate the cached result
     return {
         "score": score,
-        "matched": matched,
-        "missing": missing,
-        "warnings": warnings
+        "matched": list(matched),
+        "missing": list(missing),
+        "warnings": list(warnings)
     }
+
+@lru_cache(maxsize=32)
+def _analyze(resume_text: str, jd_text: str):
+    # cached per (resume, JD) pair; each text is cleaned once and shared
+    # between scoring and keyword matching
+    r_clean = clean_text(resume_text)
+    jd_clean = clean_text(jd_text)
+    warnings = _ats_checks(resume_text)
+    score = _match_score_clean(r_clean, jd_clean)
+    matched, missing = _keywords_from_tokens(_tokens(r_clean), _tokens(jd_clean), top_n=200)
+    return score, tuple(matched), tuple(missing), warnings